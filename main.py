@@ -2,13 +2,15 @@
 
 import sys
 import asyncio
-import threading
+import functools
+import glob
 import logging
 import os
-import subprocess
-from pathlib import Path
-from typing import Optional, Dict
+import signal
+import time
+from typing import Callable, Optional, Dict, List, Set, Tuple
 
+import dbus
 from PySide6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -27,24 +29,118 @@ from PySide6.QtWidgets import (
     QListWidgetItem,
     QFrame,
     QSizePolicy,
+    QStyle,
 )
-from PySide6.QtCore import Qt, QThread, QTimer, Signal, QSize
+from PySide6.QtCore import Qt, QEvent, QPoint, QRect, QTimer, QSize
+from PySide6.QtGui import QPainter, QPixmap, QPixmapCache
+import qasync
 
 from joycontrol import logging_default as log
 from joycontrol.controller import Controller
-from joycontrol.controller_state import (
-    ControllerState,
-    button_press,
-    button_release,
-)
-from joycontrol.memory import FlashMemory
-from joycontrol.protocol import controller_protocol_factory
-from joycontrol.server import create_hid_server
-from joycontrol.nfc_tag import NFCTag
+from joycontrol.controller_state import ControllerState
 from joycontrol.device import HidDevice
 
 logger = logging.getLogger(__name__)
 
+_PAIRED_TTL = 3.0
+_PAIRED_CACHE = {"t": 0.0, "data": None}
+
+
+def _get_paired_switches():
+    """
+    Returns the paired switch paths and the resolved (path, address) pairs.
+    Results are reused for _PAIRED_TTL seconds to avoid repeated D-Bus queries.
+    """
+    if (
+        _PAIRED_CACHE["data"] is not None
+        and time.monotonic() - _PAIRED_CACHE["t"] < _PAIRED_TTL
+    ):
+        return _PAIRED_CACHE["data"]
+
+    paired_switches = HidDevice().get_paired_switches()
+    addrs = []
+    for switch_path in paired_switches:
+        try:
+            address = HidDevice.get_address_of_paired_path(switch_path)
+            addrs.append((switch_path, address))
+        except Exception as e:
+            logger.warning("Could not get address for %s: %s", switch_path, e)
+
+    _PAIRED_CACHE["data"] = (paired_switches, addrs)
+    _PAIRED_CACHE["t"] = time.monotonic()
+    return _PAIRED_CACHE["data"]
+
+
+def _invalidate_paired_switches():
+    _PAIRED_CACHE["data"] = None
+
+
+def _remove_device_cache(address: str):
+    """
+    Best-effort removal of BlueZ's cached SDP records for a device, so that
+    pairing it again does not stall on stale records.
+    """
+    for cache_path in glob.glob(f"/var/lib/bluetooth/*/cache/{address}"):
+        try:
+            os.unlink(cache_path)
+        except OSError as e:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Could not remove %s: %s", cache_path, e)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_amiibo_bytes(path: str, mtime_ns: int, size: int, inode: int) -> bytes:
+    with open(path, "rb") as reader:
+        return reader.read()
+
+
+def _read_amiibo(path: str):
+    from joycontrol.nfc_tag import NFCTag
+
+    # size and inode are part of the key as well, so a dump replaced within the
+    # filesystem's mtime granularity (or copied with its mtime kept) is read again
+    st = os.stat(path)
+    data = _load_amiibo_bytes(path, st.st_mtime_ns, st.st_size, st.st_ino)
+    # the Switch writes to the loaded tag in place, so every load gets its own copy
+    return NFCTag(data=bytearray(data), source=path)
+
+
+# (group, title, row, col, spacing, margins, centered)
+_GROUPS = (
+    ("dpad", "D-Pad", 0, 0, 1, (0, 0, 0, 0), True),
+    ("system", "System", 0, 1, 8, (10, 10, 10, 10), True),
+    ("action", "Action Buttons", 0, 2, 1, (0, 0, 0, 0), True),
+    ("left_shoulder", "Shoulder", 1, 0, 8, (15, 10, 15, 10), False),
+    ("analog", "Analog Sticks", 1, 1, 15, (20, 15, 20, 15), True),
+    ("right_shoulder", "Shoulder", 1, 2, 8, (15, 10, 15, 10), False),
+)
+
+# (group, name, row, col, text, color, circular)
+_LAYOUT = (
+    ("dpad", "up", 0, 1, "↑", "#54585a", True),
+    ("dpad", "left", 1, 0, "←", "#54585a", True),
+    ("dpad", "right", 1, 2, "→", "#54585a", True),
+    ("dpad", "down", 2, 1, "↓", "#54585a", True),
+    ("system", "minus", 0, 0, "−", "#707372", False),
+    ("system", "home", 0, 1, "HOME", "#707372", False),
+    ("system", "plus", 0, 2, "+", "#707372", False),
+    ("system", "capture", 1, 1, "⧇", "#707372", False),
+    ("action", "x", 0, 1, "X", "#a7a4e0", True),
+    ("action", "y", 1, 0, "Y", "#a7a4e0", True),
+    ("action", "b", 2, 1, "B", "#514689", True),
+    ("action", "a", 1, 2, "A", "#514689", True),
+    ("left_shoulder", "l", 0, 0, "L", "#707372", False),
+    ("left_shoulder", "zl", 1, 0, "ZL", "#707372", False),
+    ("analog", "l_stick", 0, 0, "L3", "#707372", True),
+    ("analog", "r_stick", 0, 1, "R3", "#707372", True),
+    ("right_shoulder", "r", 0, 0, "R", "#707372", False),
+    ("right_shoulder", "zr", 1, 0, "ZR", "#707372", False),
+)
+
+_BUTTON_SIZE = {"l_stick": 45, "r_stick": 45}
+
+_PATH_ROLE = Qt.UserRole + 1
+
 
 class DarkTheme:
     BG_DARK = "#2a2d30"
@@ -71,20 +167,23 @@ class DarkTheme:
 
     @staticmethod
     def get_stylesheet():
-        return f"""
+        return _STYLESHEET
+
+
+_STYLESHEET_TEMPLATE = """
         QMainWindow {{
-            background-color: {DarkTheme.BG_DARK};
-            color: {DarkTheme.TEXT_PRIMARY};
+            background-color: {BG_DARK};
+            color: {TEXT_PRIMARY};
         }}
         
         QWidget {{
-            background-color: {DarkTheme.BG_DARK};
-            color: {DarkTheme.TEXT_PRIMARY};
+            background-color: {BG_DARK};
+            color: {TEXT_PRIMARY};
         }}
         
         QGroupBox {{
-            background-color: {DarkTheme.BG_MEDIUM};
-            border: 1px solid {DarkTheme.BORDER};
+            background-color: {BG_MEDIUM};
+            border: 1px solid {BORDER};
             border-radius: 4px;
             margin-top: 1ex;
             padding-top: 5px;
@@ -96,18 +195,18 @@ class DarkTheme:
             subcontrol-origin: margin;
             left: 5px;
             padding: 0 4px 0 4px;
-            color: {DarkTheme.TEXT_PRIMARY};
+            color: {TEXT_PRIMARY};
         }}
         
         QLabel {{
-            color: {DarkTheme.TEXT_PRIMARY};
+            color: {TEXT_PRIMARY};
             font-size: 8pt;
             background-color: transparent;
         }}
         
         QPushButton {{
-            background-color: {DarkTheme.BTN_PRIMARY};
-            color: {DarkTheme.TEXT_PRIMARY};
+            background-color: {BTN_PRIMARY};
+            color: {TEXT_PRIMARY};
             border: none;
             border-radius: 3px;
             padding: 4px 8px;
@@ -118,29 +217,29 @@ class DarkTheme:
         }}
         
         QPushButton:hover {{
-            background-color: {DarkTheme.ACCENT_HOVER};
+            background-color: {ACCENT_HOVER};
         }}
         
         QPushButton:pressed {{
-            background-color: {DarkTheme.BG_DARK};
+            background-color: {BG_DARK};
         }}
         
         QPushButton:disabled {{
-            background-color: {DarkTheme.BG_LIGHT};
-            color: {DarkTheme.TEXT_MUTED};
+            background-color: {BG_LIGHT};
+            color: {TEXT_MUTED};
         }}
         
         QComboBox {{
-            background-color: {DarkTheme.BG_LIGHT};
-            color: {DarkTheme.TEXT_PRIMARY};
-            border: 1px solid {DarkTheme.BORDER};
+            background-color: {BG_LIGHT};
+            color: {TEXT_PRIMARY};
+            border: 1px solid {BORDER};
             border-radius: 3px;
             padding: 3px 6px;
             font-size: 8pt;
         }}
         
         QComboBox:hover {{
-            border-color: {DarkTheme.ACCENT};
+            border-color: {ACCENT};
         }}
         
         QComboBox::drop-down {{
@@ -152,38 +251,38 @@ class DarkTheme:
             image: none;
             border-left: 5px solid transparent;
             border-right: 5px solid transparent;
-            border-top: 5px solid {DarkTheme.TEXT_PRIMARY};
+            border-top: 5px solid {TEXT_PRIMARY};
         }}
         
         QComboBox QAbstractItemView {{
-            background-color: {DarkTheme.BG_MEDIUM};
-            color: {DarkTheme.TEXT_PRIMARY};
-            border: 1px solid {DarkTheme.BORDER};
-            selection-background-color: {DarkTheme.ACCENT};
+            background-color: {BG_MEDIUM};
+            color: {TEXT_PRIMARY};
+            border: 1px solid {BORDER};
+            selection-background-color: {ACCENT};
         }}
         
         QLineEdit {{
-            background-color: {DarkTheme.BG_LIGHT};
-            color: {DarkTheme.TEXT_PRIMARY};
-            border: 1px solid {DarkTheme.BORDER};
+            background-color: {BG_LIGHT};
+            color: {TEXT_PRIMARY};
+            border: 1px solid {BORDER};
             border-radius: 3px;
             padding: 3px 6px;
             font-size: 8pt;
         }}
         
         QLineEdit:focus {{
-            border-color: {DarkTheme.ACCENT};
+            border-color: {ACCENT};
         }}
         
         QDialog {{
-            background-color: {DarkTheme.BG_DARK};
-            color: {DarkTheme.TEXT_PRIMARY};
+            background-color: {BG_DARK};
+            color: {TEXT_PRIMARY};
         }}
         
         QListWidget {{
-            background-color: {DarkTheme.BG_MEDIUM};
-            color: {DarkTheme.TEXT_PRIMARY};
-            border: 1px solid {DarkTheme.BORDER};
+            background-color: {BG_MEDIUM};
+            color: {TEXT_PRIMARY};
+            border: 1px solid {BORDER};
             border-radius: 3px;
             padding: 4px;
             font-size: 8pt;
@@ -195,19 +294,144 @@ class DarkTheme:
         }}
         
         QListWidget::item:selected {{
-            background-color: {DarkTheme.ACCENT};
+            background-color: {ACCENT};
         }}
         
         QListWidget::item:hover {{
-            background-color: {DarkTheme.BG_LIGHT};
+            background-color: {BG_LIGHT};
         }}
         
         QFrame {{
             background-color: transparent;
             border: none;
         }}
+        
+        QLabel#dialogTitle {{
+            font-size: 11pt;
+            font-weight: bold;
+            color: {TEXT_PRIMARY};
+            margin: 5px;
+        }}
+        
+        QLabel#dialogDesc {{
+            color: {TEXT_SECONDARY};
+            margin-bottom: 10px;
+            font-size: 9pt;
+        }}
+        
+        QLabel#sectionLabel {{
+            font-weight: bold;
+            font-size: 10pt;
+            margin-bottom: 8px;
+        }}
+        
+        QLabel#versionLabel {{
+            color: {TEXT_MUTED};
+            font-size: 8pt;
+        }}
+        
+        QPushButton#dialogBtn {{
+            font-weight: bold;
+            min-height: 18px;
+            font-size: 9pt;
+        }}
+        
+        QPushButton#connectBtn {{
+            min-width: 60px;
+            min-height: 18px;
+            font-size: 9pt;
+        }}
+        
+        QPushButton#amiiboBtn {{
+            min-height: 18px;
+            font-size: 9pt;
+        }}
+        
+        QPushButton#amiiboBtn[amiiboReady="true"] {{
+            min-height: 35px;
+            font-size: 8pt;
+        }}
         """
 
+_STYLESHEET = _STYLESHEET_TEMPLATE.format(
+    **{name: value for name, value in vars(DarkTheme).items() if name.isupper()}
+)
+
+_STATUS_QSS = {
+    "connecting": f"color: {DarkTheme.WARNING}; font-weight: bold;",
+    "connected": f"color: {DarkTheme.BTN_ACTION}; font-weight: bold;",
+    "error": f"color: {DarkTheme.ERROR}; font-weight: bold;",
+}
+
+_INFO_QSS = {
+    "idle": f"color: {DarkTheme.TEXT_SECONDARY}; font-size: 9pt;",
+    "connected": f"color: {DarkTheme.BTN_ACTION}; font-size: 9pt;",
+    "error": f"color: {DarkTheme.ERROR}; font-size: 9pt;",
+}
+
+_AMIIBO_QSS = {
+    "empty": f"color: {DarkTheme.TEXT_MUTED}; font-size: 9pt;",
+    "loaded": f"color: {DarkTheme.BTN_ACTION}; font-weight: bold; font-size: 9pt;",
+}
+
+_HOVER_MAP = {
+    DarkTheme.BTN_PRIMARY: DarkTheme.ACCENT_HOVER,
+    DarkTheme.BTN_SUCCESS: "#20c997",
+    DarkTheme.BTN_DANGER: "#e85a5a",
+    DarkTheme.BTN_WARNING: "#ffcd39",
+    DarkTheme.BTN_SECONDARY: "#8a8d8f",
+    DarkTheme.BTN_ACTION: "#bbb8e8",
+    DarkTheme.BTN_SPECIAL: "#7d4dd3",
+}
+
+
+# theme colors are folded in at import; only the per-button values remain
+_BUTTON_QSS = {
+    True: f"""
+    QPushButton {{
+        background-color: %(base_color)s;
+        color: {DarkTheme.TEXT_PRIMARY};
+        border: none;
+        border-radius: %(radius)dpx;
+        font-weight: bold;
+        font-size: 10pt;
+        text-align: center;
+    }}
+    QPushButton[controllerPressed="true"] {{
+        background-color: {DarkTheme.BG_DARK};
+    }}
+    QPushButton:hover {{
+        background-color: %(hover_color)s;
+    }}
+    QPushButton:pressed {{
+        background-color: {DarkTheme.BG_DARK};
+        border: 2px solid %(base_color)s;
+    }}
+""",
+    False: f"""
+    QPushButton {{
+        background-color: %(base_color)s;
+        color: {DarkTheme.TEXT_PRIMARY};
+        border: none;
+        border-radius: %(radius)dpx;
+        font-weight: bold;
+        font-size: 10pt;
+        min-height: 22px;
+        text-align: center;
+    }}
+    QPushButton[controllerPressed="true"] {{
+        background-color: {DarkTheme.BG_DARK};
+    }}
+    QPushButton:hover {{
+        background-color: %(hover_color)s;
+    }}
+    QPushButton:pressed {{
+        background-color: {DarkTheme.BG_DARK};
+        border: 1px solid %(base_color)s;
+    }}
+""",
+}
+
 
 class PairedSwitchDialog(QDialog):
     def __init__(self, parent=None):
@@ -218,6 +442,7 @@ class PairedSwitchDialog(QDialog):
 
         self.selected_address = None
         self.start_fresh = False
+        self._hid_device = None
 
         self.setup_ui()
         self.detect_paired_switches()
@@ -227,18 +452,14 @@ class PairedSwitchDialog(QDialog):
 
         title = QLabel("Connect to your Nintendo Switch")
         title.setAlignment(Qt.AlignCenter)
-        title.setStyleSheet(
-            f"font-size: 11pt; font-weight: bold; color: {DarkTheme.TEXT_PRIMARY}; margin: 5px;"
-        )
+        title.setObjectName("dialogTitle")
         layout.addWidget(title)
 
         self.desc = QLabel(
             "Found paired Nintendo Switch devices. Choose how to connect:"
         )
         self.desc.setAlignment(Qt.AlignCenter)
-        self.desc.setStyleSheet(
-            f"color: {DarkTheme.TEXT_SECONDARY}; margin-bottom: 10px; font-size: 9pt;"
-        )
+        self.desc.setObjectName("dialogDesc")
         layout.addWidget(self.desc)
 
         self.devices_group = QGroupBox("Paired Consoles")
@@ -253,29 +474,21 @@ class PairedSwitchDialog(QDialog):
         button_layout = QHBoxLayout()
 
         self.use_paired_btn = QPushButton("Use Selected Console")
-        self.use_paired_btn.setStyleSheet(
-            f"font-weight: bold; min-height: 18px; font-size: 9pt;"
-        )
+        self.use_paired_btn.setObjectName("dialogBtn")
         self.use_paired_btn.clicked.connect(self.use_paired_device)
         self.use_paired_btn.setEnabled(False)
 
         self.unpair_btn = QPushButton("Unpair Selected Console")
-        self.unpair_btn.setStyleSheet(
-            f"font-weight: bold; min-height: 18px; font-size: 9pt;"
-        )
+        self.unpair_btn.setObjectName("dialogBtn")
         self.unpair_btn.clicked.connect(self.unpair_device)
         self.unpair_btn.setEnabled(False)
 
         self.start_fresh_btn = QPushButton("Pair New Console")
-        self.start_fresh_btn.setStyleSheet(
-            f"font-weight: bold; min-height: 18px; font-size: 9pt;"
-        )
+        self.start_fresh_btn.setObjectName("dialogBtn")
         self.start_fresh_btn.clicked.connect(self.start_fresh_pairing)
 
         cancel_btn = QPushButton("Cancel")
-        cancel_btn.setStyleSheet(
-            f"font-weight: bold; min-height: 18px; font-size: 9pt;"
-        )
+        cancel_btn.setObjectName("dialogBtn")
         cancel_btn.clicked.connect(self.reject)
 
         button_layout.addWidget(self.use_paired_btn)
@@ -289,8 +502,7 @@ class PairedSwitchDialog(QDialog):
 
     def detect_paired_switches(self):
         try:
-            hid_device = HidDevice()
-            paired_switches = hid_device.get_paired_switches()
+            paired_switches, addrs = _get_paired_switches()
 
             if not paired_switches:
                 self.devices_group.setTitle("No Paired Consoles Found")
@@ -302,34 +514,38 @@ class PairedSwitchDialog(QDialog):
                 item.setData(Qt.UserRole, None)
                 self.devices_list.addItem(item)
                 self.use_paired_btn.setEnabled(False)
-            else:
-                valid_devices_added = 0
-                for switch_path in paired_switches:
-                    try:
-                        address = HidDevice.get_address_of_paired_path(switch_path)
-                        item = QListWidgetItem(f"Nintendo Switch - {address}")
-                        item.setData(Qt.UserRole, address)
+            elif addrs:
+                items = []
+                for switch_path, address in addrs:
+                    item = QListWidgetItem(f"Nintendo Switch - {address}")
+                    item.setData(Qt.UserRole, address)
+                    item.setData(_PATH_ROLE, switch_path)
+                    items.append(item)
+
+                self.devices_list.setUpdatesEnabled(False)
+                self.devices_list.blockSignals(True)
+                try:
+                    for item in items:
                         self.devices_list.addItem(item)
-                        valid_devices_added += 1
-                    except Exception as e:
-                        logger.warning(f"Could not get address for {switch_path}: {e}")
-
-                if valid_devices_added > 0:
-                    self.devices_list.setCurrentRow(0)
-                elif valid_devices_added == 0:
-                    self.devices_group.setTitle("No Valid Devices Found")
-                    self.desc.setText(
-                        "No paired consoles found. You can pair a new console below:"
-                    )
-                    self.devices_list.clear()
-                    item = QListWidgetItem("No valid Nintendo Switch consoles detected")
-                    item.setFlags(Qt.NoItemFlags)
-                    item.setData(Qt.UserRole, None)
-                    self.devices_list.addItem(item)
-                    self.use_paired_btn.setEnabled(False)
+                finally:
+                    self.devices_list.blockSignals(False)
+                    self.devices_list.setUpdatesEnabled(True)
+
+                self.devices_list.setCurrentRow(0)
+            else:
+                self.devices_group.setTitle("No Valid Devices Found")
+                self.desc.setText(
+                    "No paired consoles found. You can pair a new console below:"
+                )
+                self.devices_list.clear()
+                item = QListWidgetItem("No valid Nintendo Switch consoles detected")
+                item.setFlags(Qt.NoItemFlags)
+                item.setData(Qt.UserRole, None)
+                self.devices_list.addItem(item)
+                self.use_paired_btn.setEnabled(False)
 
         except Exception as e:
-            logger.error(f"Error detecting paired switches: {e}")
+            logger.error("Error detecting paired switches: %s", e)
             self.devices_group.setTitle("Error Detecting Devices")
             self.desc.setText(
                 "No paired consoles found. You can pair a new console below:"
@@ -357,12 +573,18 @@ class PairedSwitchDialog(QDialog):
         self.start_fresh = True
         self.accept()
 
+    def _remove_device(self, switch_path: str):
+        if self._hid_device is None:
+            self._hid_device = HidDevice()
+        self._hid_device.unpair_path(switch_path)
+
     def unpair_device(self):
         selected_items = self.devices_list.selectedItems()
         if not selected_items:
             return
 
         address = selected_items[0].data(Qt.UserRole)
+        switch_path = selected_items[0].data(_PATH_ROLE)
         if not address:
             return
 
@@ -378,54 +600,97 @@ class PairedSwitchDialog(QDialog):
         if reply != QMessageBox.Yes:
             return
 
-        try:
-            result = subprocess.run(
-                ["bluetoothctl", "remove", address],
-                capture_output=True,
-                text=True,
-                timeout=10,
+        # only the D-Bus call runs off the GUI thread; the result is reported from
+        # a done callback so no modal box is opened while a task is executing
+        self.unpair_btn.setEnabled(False)
+        loop = asyncio.get_event_loop()
+        task = asyncio.ensure_future(
+            asyncio.wait_for(
+                loop.run_in_executor(None, self._remove_device, switch_path), 10
             )
+        )
+        task.add_done_callback(functools.partial(self._on_unpair_done, address))
 
-            if result.returncode == 0:
-                QMessageBox.information(
-                    self,
-                    "Success",
-                    f"Successfully unpaired Nintendo Switch ({address})",
-                )
-                self.devices_list.clear()
-                self.detect_paired_switches()
-            else:
-                error_msg = (
-                    result.stderr.strip() or result.stdout.strip() or "Unknown error"
-                )
-                QMessageBox.critical(
-                    self,
-                    "Unpair Failed",
-                    f"Failed to unpair device ({address}):\n{error_msg}",
-                )
+    def _on_unpair_done(self, address: str, task: asyncio.Future):
+        if task.cancelled():
+            return
+
+        error = task.exception()
+        if error is None:
+            _invalidate_paired_switches()
+            _remove_device_cache(address)
+            QMessageBox.information(
+                self,
+                "Success",
+                f"Successfully unpaired Nintendo Switch ({address})",
+            )
+            self.devices_list.clear()
+            self.detect_paired_switches()
+            return
 
-        except subprocess.TimeoutExpired:
+        self.on_selection_changed()
+        if isinstance(error, asyncio.TimeoutError):
             QMessageBox.critical(
                 self,
                 "Timeout Error",
-                "bluetoothctl command timed out. Please try again.",
+                "BlueZ did not respond in time. Please try again.",
             )
-        except FileNotFoundError:
+        elif isinstance(error, dbus.exceptions.DBusException):
             QMessageBox.critical(
                 self,
-                "Error",
-                "bluetoothctl command not found. Please ensure BlueZ is installed.",
+                "Unpair Failed",
+                f"Failed to unpair device ({address}):\n{error.get_dbus_message()}",
             )
-        except Exception as e:
-            logger.error(f"Error unpairing device: {e}")
+        else:
+            logger.error("Error unpairing device: %s", error)
             QMessageBox.critical(
-                self, "Error", f"Unexpected error while unpairing: {str(e)}"
+                self, "Error", f"Unexpected error while unpairing: {str(error)}"
             )
 
 
+class CachedTextLabel(QLabel):
+    """Static label whose rendered text is reused from QPixmapCache."""
+
+    def paintEvent(self, event):
+        rect = self.contentsRect()
+        if rect.isEmpty():
+            return
+
+        # the pixmap is sized to the text, not the label, so resizing the
+        # label only moves it and never invalidates the cache entry
+        size = self.fontMetrics().boundingRect(self.text()).size()
+        dpr = self.devicePixelRatioF()
+        color = self.palette().color(self.foregroundRole())
+        key = "sectionLabel:%s:%s:%s@%s" % (
+            self.text(),
+            self.font().key(),
+            color.name(),
+            dpr,
+        )
+
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None or pixmap.isNull():
+            pixmap = QPixmap(round(size.width() * dpr), round(size.height() * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.transparent)
+            text_painter = QPainter(pixmap)
+            text_painter.setFont(self.font())
+            text_painter.setPen(color)
+            text_painter.drawText(
+                QRect(QPoint(0, 0), size), Qt.AlignCenter, self.text()
+            )
+            text_painter.end()
+            QPixmapCache.insert(key, pixmap)
+
+        target = QStyle.alignedRect(
+            self.layoutDirection(), self.alignment(), size, rect
+        )
+        painter = QPainter(self)
+        painter.drawPixmap(target.topLeft(), pixmap)
+
+
 class ControllerButton(QPushButton):
-    button_pressed = Signal(str)
-    button_released = Signal(str)
+    _STYLE_CACHE: Dict[Tuple[str, bool, int], str] = {}
 
     def __init__(
         self,
@@ -433,164 +698,76 @@ class ControllerButton(QPushButton):
         text: str = None,
         color: str = None,
         circular: bool = False,
+        size: int = 40,
         parent=None,
     ):
         super().__init__(parent)
         self.button_name = button_name
         self.base_color = color or DarkTheme.BTN_PRIMARY
+        self._hover_color = _HOVER_MAP.get(self.base_color, DarkTheme.ACCENT_HOVER)
         self.is_controller_pressed = False
         self.is_circular = circular
+        self._side = size
+        self._cached_hint: Optional[QSize] = None
 
         self.setText(text or button_name.upper())
+        self.setProperty("controllerPressed", False)
 
         if circular:
-            self.setMinimumSize(QSize(30, 30))
-            self.setMaximumSize(QSize(80, 80))
-            self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
+            self.setFixedSize(QSize(size, size))
         else:
             self.setMinimumSize(QSize(50, 25))
-            self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+            self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
 
         self.update_style()
 
-        self.pressed.connect(self.on_press)
-        self.released.connect(self.on_release)
-
-    def sizeHint(self):
-        if self.is_circular:
-            return QSize(40, 40)
-        else:
-            return super().sizeHint()
-
-    def minimumSizeHint(self):
-        if self.is_circular:
-            return QSize(30, 30)
-        else:
-            return super().minimumSizeHint()
-
-    def hasHeightForWidth(self):
-        return self.is_circular
-
-    def heightForWidth(self, width):
-        if self.is_circular:
-            return width
-        return (
-            super().heightForWidth(width)
-            if hasattr(super(), "heightForWidth")
-            else width
-        )
-
     def update_style(self):
-        if self.is_controller_pressed:
-            bg_color = DarkTheme.BG_DARK
-        else:
-            bg_color = self.base_color
-
-        hover_color = self.get_hover_color(self.base_color)
-
+        radius = self._side // 2 if self.is_circular else 4
+
+        key = (self.base_color, self.is_circular, radius)
+        stylesheet = self._STYLE_CACHE.get(key)
+        if stylesheet is None:
+            stylesheet = self._STYLE_CACHE[key] = self.build_style(*key)
+        self._cached_hint = None
+        self.setStyleSheet(stylesheet)
+
+    def sizeHint(self) -> QSize:
+        # the global QPushButton min-height replaces the minimum set by
+        # setFixedSize, so circular buttons report their square size themselves
         if self.is_circular:
-            current_size = min(self.width(), self.height())
-            radius = max(12, current_size // 2)
-
-            self.setStyleSheet(
-                f"""
-                QPushButton {{
-                    background-color: {bg_color};
-                    color: {DarkTheme.TEXT_PRIMARY};
-                    border: none;
-                    border-radius: {radius}px;
-                    font-weight: bold;
-                    font-size: 10pt;
-                    text-align: center;
-                }}
-                QPushButton:hover {{
-                    background-color: {hover_color};
-                }}
-                QPushButton:pressed {{
-                    background-color: {DarkTheme.BG_DARK};
-                    border: 2px solid {self.base_color};
-                }}
-            """
-            )
-        else:
-            self.setStyleSheet(
-                f"""
-                QPushButton {{
-                    background-color: {bg_color};
-                    color: {DarkTheme.TEXT_PRIMARY};
-                    border: none;
-                    border-radius: 4px;
-                    font-weight: bold;
-                    font-size: 10pt;
-                    min-height: 22px;
-                    text-align: center;
-                }}
-                QPushButton:hover {{
-                    background-color: {hover_color};
-                }}
-                QPushButton:pressed {{
-                    background-color: {DarkTheme.BG_DARK};
-                    border: 1px solid {self.base_color};
-                }}
-            """
-            )
+            return QSize(self._side, self._side)
+        # the pressed state only recolors the button, so the hint survives it
+        if self._cached_hint is None:
+            self._cached_hint = super().sizeHint()
+        return self._cached_hint
 
-    def get_hover_color(self, base_color: str) -> str:
-        hover_map = {
-            DarkTheme.BTN_PRIMARY: DarkTheme.ACCENT_HOVER,
-            DarkTheme.BTN_SUCCESS: "#20c997",
-            DarkTheme.BTN_DANGER: "#e85a5a",
-            DarkTheme.BTN_WARNING: "#ffcd39",
-            DarkTheme.BTN_SECONDARY: "#8a8d8f",
-            DarkTheme.BTN_ACTION: "#bbb8e8",
-            DarkTheme.BTN_SPECIAL: "#7d4dd3",
+    def minimumSizeHint(self) -> QSize:
+        if self.is_circular:
+            return QSize(self._side, self._side)
+        return super().minimumSizeHint()
+
+    def changeEvent(self, event):
+        # padding and borders from a parent stylesheet arrive as StyleChange
+        if event.type() in (QEvent.FontChange, QEvent.StyleChange):
+            self._cached_hint = None
+        super().changeEvent(event)
+
+    def build_style(self, base_color: str, is_circular: bool, radius: int) -> str:
+        return _BUTTON_QSS[is_circular] % {
+            "base_color": base_color,
+            "hover_color": self._hover_color,
+            "radius": radius,
         }
-        return hover_map.get(base_color, DarkTheme.ACCENT_HOVER)
-
-    def on_press(self):
-        self.button_pressed.emit(self.button_name)
-
-    def on_release(self):
-        self.button_released.emit(self.button_name)
 
     def set_controller_pressed(self, pressed: bool):
-        self.is_controller_pressed = pressed
-        self.update_style()
-
-    def resizeEvent(self, event):
-        if self.is_circular:
-            size = event.size()
-            min_dimension = min(size.width(), size.height())
-
-            if size.width() != min_dimension or size.height() != min_dimension:
-                self.resize(min_dimension, min_dimension)
-
-            self.update_style()
-        super().resizeEvent(event)
-
-
-class AsyncWorker(QThread):
-    finished = Signal(bool, str)
-
-    def __init__(self, async_loop, coro):
-        super().__init__()
-        self.async_loop = async_loop
-        self.coro = coro
-        self.future = None
+        if pressed == self.is_controller_pressed:
+            return
 
-    def run(self):
-        try:
-            if self.async_loop and not self.async_loop.is_closed():
-                self.future = asyncio.run_coroutine_threadsafe(
-                    self.coro, self.async_loop
-                )
-                self.future.result()
-                self.finished.emit(True, "Success")
-            else:
-                self.finished.emit(False, "Async loop not available")
-        except Exception as e:
-            logger.error(f"AsyncWorker error: {e}")
-            self.finished.emit(False, str(e))
+        self.is_controller_pressed = pressed
+        self.setProperty("controllerPressed", pressed)
+        self.style().unpolish(self)
+        self.style().polish(self)
+        self.update()
 
 
 class JoyControlGUI(QMainWindow):
@@ -600,33 +777,43 @@ class JoyControlGUI(QMainWindow):
         self.controller_state: Optional[ControllerState] = None
         self.transport = None
         self.protocol = None
+        self._itr_sock = None
+        self._peer_addr: Optional[str] = None
         self.connected = False
         self.reconnect_address = None
-        self._last_connected_address = None
-
-        self.button_widgets: Dict[str, ControllerButton] = {}
-        self.button_states: Dict[str, bool] = {}
+        self._last_connected_address: Optional[str] = None
+
+        # button name -> index into the parallel _widgets / _states arrays
+        self._name_to_idx: Dict[str, int] = {}
+        self._widgets: List[ControllerButton] = []
+        self._states = bytearray()
+        self._pending_press: Set[str] = set()
+        self._pending_release: Set[str] = set()
+        self._button_pump: Optional[asyncio.Task] = None
+        self._press_fn: Dict[str, Callable[[], None]] = {}
+        self._release_fn: Dict[str, Callable[[], None]] = {}
 
         self.current_amiibo = None
 
-        self.async_loop = None
-        self.async_thread = None
-        self.connection_worker = None
+        self.connection_task: Optional[asyncio.Task] = None
+
+        # built on first use and reused for every later message
+        self._error_dialog: Optional[QMessageBox] = None
+        self._warning_dialog: Optional[QMessageBox] = None
 
-        self.connection_monitor_timer = QTimer()
-        self.connection_monitor_timer.timeout.connect(self.check_connection_status)
-        self.connection_monitor_timer.setInterval(1000)
+        # connection loss is reported through the protocol; this is only a fallback
+        self.connection_heartbeat = QTimer(self)
+        self.connection_heartbeat.setInterval(5000)
+        self.connection_heartbeat.timeout.connect(self.check_connection_status)
 
         self.setup_window()
-        self.setup_async_loop()
 
-        QTimer.singleShot(100, self.show_startup_dialog)
+        QTimer.singleShot(0, self.show_startup_dialog)
 
     def setup_window(self):
         self.setWindowTitle("joycontrol-gui")
         self.setMinimumSize(600, 600)
 
-        self.setAttribute(Qt.WA_AcceptTouchEvents, False)
         self.setStyleSheet(DarkTheme.get_stylesheet())
 
         central_widget = QWidget()
@@ -653,17 +840,13 @@ class JoyControlGUI(QMainWindow):
         self.reconnect_entry.hide()
 
         self.connection_info = QLabel("Click Connect to choose your Nintendo Switch")
-        self.connection_info.setStyleSheet(
-            f"color: {DarkTheme.TEXT_SECONDARY}; font-size: 9pt;"
-        )
+        self.connection_info.setStyleSheet(_INFO_QSS["idle"])
         connection_layout.addWidget(self.connection_info)
 
         connection_layout.addStretch()
 
         self.connect_btn = QPushButton("Connect")
-        self.connect_btn.setStyleSheet(
-            f"min-width: 60px; min-height: 18px; font-size: 9pt;"
-        )
+        self.connect_btn.setObjectName("connectBtn")
         self.connect_btn.clicked.connect(self.toggle_connection)
         connection_layout.addWidget(self.connect_btn)
 
@@ -683,17 +866,13 @@ class JoyControlGUI(QMainWindow):
         amiibo_layout.setSpacing(8)
 
         self.amiibo_status = QLabel("No amiibo loaded")
-        self.amiibo_status.setStyleSheet(
-            f"color: {DarkTheme.TEXT_MUTED}; font-size: 9pt;"
-        )
+        self.amiibo_status.setStyleSheet(_AMIIBO_QSS["empty"])
         amiibo_layout.addWidget(self.amiibo_status)
 
         amiibo_layout.addStretch()
 
         self.amiibo_btn = QPushButton("Load Amiibo")
-        self.amiibo_btn.setStyleSheet(
-            f"min-height: 18px; font-size: 9pt; text-align: center;"
-        )
+        self.amiibo_btn.setObjectName("amiiboBtn")
         self.amiibo_btn.clicked.connect(self.toggle_amiibo)
         amiibo_layout.addWidget(self.amiibo_btn)
 
@@ -702,10 +881,14 @@ class JoyControlGUI(QMainWindow):
     def update_amiibo_button(self):
         if self.current_amiibo:
             self.amiibo_btn.setText("Eject Amiibo")
-            self.amiibo_btn.setStyleSheet(f"min-height: 35px; font-weight: bold;")
         else:
             self.amiibo_btn.setText("Load Amiibo")
-            self.amiibo_btn.setStyleSheet(f"min-height: 35px; font-weight: bold;")
+
+        # the taller amiiboReady rule applies from the first update on
+        if not self.amiibo_btn.property("amiiboReady"):
+            self.amiibo_btn.setProperty("amiiboReady", True)
+            self.amiibo_btn.style().unpolish(self.amiibo_btn)
+            self.amiibo_btn.style().polish(self.amiibo_btn)
 
     def setup_status_section(self):
         status_frame = QFrame()
@@ -716,41 +899,44 @@ class JoyControlGUI(QMainWindow):
         status_layout.addWidget(connection_label)
 
         self.status_label = QLabel("Disconnected")
-        self.status_label.setStyleSheet(f"color: {DarkTheme.ERROR}; font-weight: bold;")
+        self.status_label.setStyleSheet(_STATUS_QSS["error"])
         status_layout.addWidget(self.status_label)
 
         status_layout.addStretch()
 
         version_label = QLabel("Made with ❤️ by EshayDev")
-        version_label.setStyleSheet(f"color: {DarkTheme.TEXT_MUTED}; font-size: 8pt;")
+        version_label.setObjectName("versionLabel")
         status_layout.addWidget(version_label)
 
         self.main_layout.addWidget(status_frame)
 
-    def setup_async_loop(self):
-        def run_loop():
-            try:
-                self.async_loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(self.async_loop)
-                logger.info("Async loop started")
-                self.async_loop.run_forever()
-            except Exception as e:
-                logger.error(f"Error in async loop: {e}")
-            finally:
-                logger.info("Async loop stopped")
-
-        self.async_thread = threading.Thread(target=run_loop, daemon=True)
-        self.async_thread.start()
-
-        import time
-
-        time.sleep(0.1)
-
     def run_async(self, coro):
-        if self.async_loop:
-            future = asyncio.run_coroutine_threadsafe(coro, self.async_loop)
-            return future
-        return None
+        return asyncio.ensure_future(coro)
+
+    def show_error(self, title: str, message: str):
+        if self._error_dialog is None:
+            self._error_dialog = QMessageBox(self)
+            self._error_dialog.setIcon(QMessageBox.Critical)
+            self._error_dialog.setStandardButtons(QMessageBox.Ok)
+        self._exec_message(self._error_dialog, title, message)
+
+    def show_warning(self, title: str, message: str):
+        if self._warning_dialog is None:
+            self._warning_dialog = QMessageBox(self)
+            self._warning_dialog.setIcon(QMessageBox.Warning)
+            self._warning_dialog.setStandardButtons(QMessageBox.Ok)
+        self._exec_message(self._warning_dialog, title, message)
+
+    def _exec_message(self, dialog: QMessageBox, title: str, message: str):
+        # a message arriving while the cached box is still open gets a box of its
+        # own; re-entering exec() would drop it and overwrite the visible text
+        if dialog.isVisible():
+            dialog = QMessageBox(dialog.icon(), title, message, QMessageBox.Ok, self)
+            dialog.setAttribute(Qt.WA_DeleteOnClose)
+        else:
+            dialog.setWindowTitle(title)
+            dialog.setText(message)
+        dialog.exec()
 
     def show_startup_dialog(self):
         try:
@@ -765,7 +951,7 @@ class JoyControlGUI(QMainWindow):
                     self.connect()
 
         except Exception as e:
-            logger.error(f"Error in startup dialog: {e}")
+            logger.error("Error in startup dialog: %s", e)
 
     def show_connection_dialog(self):
         try:
@@ -781,19 +967,19 @@ class JoyControlGUI(QMainWindow):
                     self.connect()
 
         except Exception as e:
-            logger.error(f"Error in connection dialog: {e}")
-            QMessageBox.critical(
-                self, "Error", f"Failed to show connection dialog: {e}"
-            )
+            logger.error("Error in connection dialog: %s", e)
+            self.show_error("Error", f"Failed to show connection dialog: {e}")
 
     def create_controller_layout(self):
-        for i in reversed(range(self.controller_layout.count())):
-            child = self.controller_layout.takeAt(i)
-            if child.widget():
-                child.widget().deleteLater()
+        # the controller layout only ever holds the single widget built below
+        old = self.controller_layout.takeAt(0)
+        if old is not None and old.widget():
+            old.widget().setParent(None)
+            old.widget().deleteLater()
 
-        self.button_widgets.clear()
-        self.button_states.clear()
+        self._name_to_idx.clear()
+        self._widgets.clear()
+        self._states.clear()
 
         self.create_pro_controller_layout()
 
@@ -803,167 +989,30 @@ class JoyControlGUI(QMainWindow):
         main_layout.setSpacing(15)
         main_layout.setContentsMargins(5, 5, 5, 5)
 
-        dpad_frame = QFrame()
-        dpad_frame_layout = QVBoxLayout(dpad_frame)
-        dpad_frame_layout.setSpacing(5)
-
-        dpad_label = QLabel("D-Pad")
-        dpad_label.setAlignment(Qt.AlignCenter)
-        dpad_label.setStyleSheet(
-            "font-weight: bold; font-size: 10pt; margin-bottom: 8px;"
-        )
-        dpad_frame_layout.addWidget(dpad_label)
-
-        dpad_widget = QWidget()
-        dpad_layout = QGridLayout(dpad_widget)
-        dpad_layout.setSpacing(1)
-        dpad_layout.setAlignment(Qt.AlignCenter)
-        dpad_layout.setContentsMargins(0, 0, 0, 0)
-
-        self.add_button(dpad_layout, "up", 0, 1, "↑", "#54585a", circular=True)
-        self.add_button(dpad_layout, "left", 1, 0, "←", "#54585a", circular=True)
-        self.add_button(dpad_layout, "right", 1, 2, "→", "#54585a", circular=True)
-        self.add_button(dpad_layout, "down", 2, 1, "↓", "#54585a", circular=True)
-
-        dpad_frame_layout.addWidget(dpad_widget, 1)
-
-        system_frame = QFrame()
-        system_frame_layout = QVBoxLayout(system_frame)
-        system_frame_layout.setSpacing(5)
-
-        system_label = QLabel("System")
-        system_label.setAlignment(Qt.AlignCenter)
-        system_label.setStyleSheet(
-            "font-weight: bold; font-size: 10pt; margin-bottom: 8px;"
-        )
-        system_frame_layout.addWidget(system_label)
-
-        system_widget = QWidget()
-        system_layout = QGridLayout(system_widget)
-        system_layout.setSpacing(8)
-        system_layout.setAlignment(Qt.AlignCenter)
-        system_layout.setContentsMargins(10, 10, 10, 10)
-
-        self.add_button(system_layout, "minus", 0, 0, "−", "#707372")
-        self.add_button(system_layout, "home", 0, 1, "HOME", "#707372")
-        self.add_button(system_layout, "plus", 0, 2, "+", "#707372")
-        self.add_button(system_layout, "capture", 1, 1, "⧇", "#707372")
-
-        for i in range(3):
-            system_layout.setColumnStretch(i, 1)
-        system_layout.setRowStretch(0, 1)
-        system_layout.setRowStretch(1, 1)
-
-        system_frame_layout.addWidget(system_widget, 1)
-
-        action_frame = QFrame()
-        action_frame_layout = QVBoxLayout(action_frame)
-        action_frame_layout.setSpacing(5)
-
-        action_label = QLabel("Action Buttons")
-        action_label.setAlignment(Qt.AlignCenter)
-        action_label.setStyleSheet(
-            "font-weight: bold; font-size: 10pt; margin-bottom: 8px;"
-        )
-        action_frame_layout.addWidget(action_label)
-
-        action_widget = QWidget()
-        action_layout = QGridLayout(action_widget)
-        action_layout.setSpacing(1)
-        action_layout.setAlignment(Qt.AlignCenter)
-        action_layout.setContentsMargins(0, 0, 0, 0)
-
-        self.add_button(action_layout, "x", 0, 1, "X", "#a7a4e0", circular=True)
-        self.add_button(action_layout, "y", 1, 0, "Y", "#a7a4e0", circular=True)
-        self.add_button(action_layout, "b", 2, 1, "B", "#514689", circular=True)
-        self.add_button(action_layout, "a", 1, 2, "A", "#514689", circular=True)
-
-        action_frame_layout.addWidget(action_widget, 1)
-
-        left_shoulder_frame = QFrame()
-        left_shoulder_layout = QVBoxLayout(left_shoulder_frame)
-        left_shoulder_layout.setSpacing(5)
-
-        left_shoulder_label = QLabel("Shoulder")
-        left_shoulder_label.setAlignment(Qt.AlignCenter)
-        left_shoulder_label.setStyleSheet(
-            "font-weight: bold; font-size: 10pt; margin-bottom: 8px;"
-        )
-        left_shoulder_layout.addWidget(left_shoulder_label)
-
-        left_shoulder_widget = QWidget()
-        left_shoulder_buttons = QVBoxLayout(left_shoulder_widget)
-        left_shoulder_buttons.setSpacing(8)
-        left_shoulder_buttons.setContentsMargins(15, 10, 15, 10)
-
-        l_btn = self.create_button("l", "L", "#707372")
-        zl_btn = self.create_button("zl", "ZL", "#707372")
-        left_shoulder_buttons.addWidget(l_btn)
-        left_shoulder_buttons.addWidget(zl_btn)
-
-        left_shoulder_layout.addWidget(left_shoulder_widget, 1)
-
-        analog_frame = QFrame()
-        analog_frame_layout = QVBoxLayout(analog_frame)
-        analog_frame_layout.setSpacing(5)
-
-        stick_label = QLabel("Analog Sticks")
-        stick_label.setAlignment(Qt.AlignCenter)
-        stick_label.setStyleSheet(
-            "font-weight: bold; font-size: 10pt; margin-bottom: 8px;"
-        )
-        analog_frame_layout.addWidget(stick_label)
-
-        stick_widget = QWidget()
-        stick_layout = QGridLayout(stick_widget)
-        stick_layout.setSpacing(15)
-        stick_layout.setAlignment(Qt.AlignCenter)
-        stick_layout.setContentsMargins(20, 15, 20, 15)
-
-        l_stick_btn = self.create_button("l_stick", "L3", "#707372", circular=True)
-        r_stick_btn = self.create_button("r_stick", "R3", "#707372", circular=True)
-
-        l_stick_btn.setMinimumSize(QSize(45, 45))
-        r_stick_btn.setMinimumSize(QSize(45, 45))
-
-        stick_layout.addWidget(l_stick_btn, 0, 0, Qt.AlignCenter)
-        stick_layout.addWidget(r_stick_btn, 0, 1, Qt.AlignCenter)
-
-        stick_layout.setColumnStretch(0, 1)
-        stick_layout.setColumnStretch(1, 1)
-        stick_layout.setRowStretch(0, 1)
-
-        analog_frame_layout.addWidget(stick_widget, 1)
-
-        right_shoulder_frame = QFrame()
-        right_shoulder_layout = QVBoxLayout(right_shoulder_frame)
-        right_shoulder_layout.setSpacing(5)
-
-        right_shoulder_label = QLabel("Shoulder")
-        right_shoulder_label.setAlignment(Qt.AlignCenter)
-        right_shoulder_label.setStyleSheet(
-            "font-weight: bold; font-size: 10pt; margin-bottom: 8px;"
-        )
-        right_shoulder_layout.addWidget(right_shoulder_label)
-
-        right_shoulder_widget = QWidget()
-        right_shoulder_buttons = QVBoxLayout(right_shoulder_widget)
-        right_shoulder_buttons.setSpacing(8)
-        right_shoulder_buttons.setContentsMargins(15, 10, 15, 10)
+        buttons = [
+            (group, row, col, self.create_button(name, text, color, circular))
+            for group, name, row, col, text, color, circular in _LAYOUT
+        ]
 
-        r_btn = self.create_button("r", "R", "#707372")
-        zr_btn = self.create_button("zr", "ZR", "#707372")
-        right_shoulder_buttons.addWidget(r_btn)
-        right_shoulder_buttons.addWidget(zr_btn)
+        group_layouts = {}
+        for group, title, row, col, spacing, margins, centered in _GROUPS:
+            frame, group_layouts[group] = self.build_section(
+                title, spacing, margins, centered
+            )
+            main_layout.addWidget(frame, row, col)
 
-        right_shoulder_layout.addWidget(right_shoulder_widget, 1)
+        for group, row, col, button in buttons:
+            group_layout = group_layouts[group]
+            if button.is_circular:
+                group_layout.addWidget(button, row, col, Qt.AlignCenter)
+            else:
+                group_layout.addWidget(button, row, col)
 
-        main_layout.addWidget(dpad_frame, 0, 0)
-        main_layout.addWidget(system_frame, 0, 1)
-        main_layout.addWidget(action_frame, 0, 2)
-        main_layout.addWidget(left_shoulder_frame, 1, 0)
-        main_layout.addWidget(analog_frame, 1, 1)
-        main_layout.addWidget(right_shoulder_frame, 1, 2)
+        for group_layout in group_layouts.values():
+            for row in range(group_layout.rowCount()):
+                group_layout.setRowStretch(row, 1)
+            for col in range(group_layout.columnCount()):
+                group_layout.setColumnStretch(col, 1)
 
         main_layout.setColumnStretch(0, 2)
         main_layout.setColumnStretch(1, 3)
@@ -974,35 +1023,46 @@ class JoyControlGUI(QMainWindow):
 
         self.controller_layout.addWidget(main_widget)
 
+    def build_section(
+        self,
+        title: str,
+        spacing: int,
+        margins: Tuple[int, int, int, int],
+        centered: bool,
+    ) -> Tuple[QFrame, QGridLayout]:
+        frame = QFrame()
+        frame_layout = QVBoxLayout(frame)
+        frame_layout.setSpacing(5)
+
+        label = CachedTextLabel(title)
+        label.setAlignment(Qt.AlignCenter)
+        label.setObjectName("sectionLabel")
+        frame_layout.addWidget(label)
+
+        section_widget = QWidget()
+        section_layout = QGridLayout(section_widget)
+        section_layout.setSpacing(spacing)
+        section_layout.setContentsMargins(*margins)
+        if centered:
+            section_layout.setAlignment(Qt.AlignCenter)
+
+        frame_layout.addWidget(section_widget, 1)
+        return frame, section_layout
+
     def create_button(
         self, button_name: str, text: str, color: str, circular: bool = False
     ) -> ControllerButton:
-        button = ControllerButton(button_name, text, color, circular)
-        button.button_pressed.connect(self.on_button_press)
-        button.button_released.connect(self.on_button_release)
+        size = _BUTTON_SIZE.get(button_name, 40)
+        button = ControllerButton(button_name, text, color, circular, size)
+        button.pressed.connect(functools.partial(self.on_button_press, button_name))
+        button.released.connect(functools.partial(self.on_button_release, button_name))
 
-        self.button_widgets[button_name] = button
-        self.button_states[button_name] = False
+        self._name_to_idx[button_name] = len(self._widgets)
+        self._widgets.append(button)
+        self._states.append(0)
 
         return button
 
-    def add_button(
-        self,
-        layout: QGridLayout,
-        button_name: str,
-        row: int,
-        col: int,
-        text: str,
-        color: str,
-        circular: bool = False,
-    ):
-        button = self.create_button(button_name, text, color, circular)
-
-        if circular:
-            layout.addWidget(button, row, col, Qt.AlignCenter)
-        else:
-            layout.addWidget(button, row, col)
-
     def toggle_connection(self):
         if self.connected:
             self.disconnect()
@@ -1010,47 +1070,55 @@ class JoyControlGUI(QMainWindow):
             self.connect()
 
     def connect(self, start_fresh=False):
-        try:
-            if os.geteuid() != 0:
-                QMessageBox.critical(
-                    self, "Error", "This application must be run as root!"
-                )
-                return
+        if self.connection_task and not self.connection_task.done():
+            logger.info("Connection already in progress")
+            return
 
-            reconnect_addr = (
-                self.reconnect_entry.text().strip() or self.reconnect_address
-            )
+        try:
+            reconnect_addr = self._validate_connect_args(start_fresh)
+        except LookupError:
+            self.show_connection_dialog()
+            return
 
-            if not reconnect_addr and not start_fresh:
-                self.show_connection_dialog()
-                return
+        self._set_connecting_ui()
+        self._spawn_connect(reconnect_addr)
 
-            self.connect_btn.setText("Connecting...")
-            self.connect_btn.setEnabled(False)
-            self.status_label.setText("Connecting...")
-            self.status_label.setStyleSheet(
-                f"color: {DarkTheme.WARNING}; font-weight: bold;"
-            )
+    def _validate_connect_args(self, start_fresh: bool) -> Optional[str]:
+        """
+        Returns the address to reconnect to, or None for a fresh pairing.
+        Raises LookupError when reconnecting but no address is known yet.
+        """
+        if start_fresh:
+            return None
 
-            controller_type = "PRO_CONTROLLER"
+        reconnect_addr = self.reconnect_entry.text().strip() or self.reconnect_address
+        if not reconnect_addr:
+            raise LookupError("No address to reconnect to")
+        return reconnect_addr
 
-            final_reconnect_addr = None if start_fresh else reconnect_addr
+    def _set_connecting_ui(self):
+        self.connect_btn.setText("Connecting...")
+        self.connect_btn.setEnabled(False)
+        self.status_label.setText("Connecting...")
+        self.status_label.setStyleSheet(_STATUS_QSS["connecting"])
 
-            logger.info(
-                f"Starting connection. Start fresh: {start_fresh}, Reconnect addr: {final_reconnect_addr}"
-            )
-
-            connection_coro = self._connect_async(controller_type, final_reconnect_addr)
-            self.connection_worker = AsyncWorker(self.async_loop, connection_coro)
-            self.connection_worker.finished.connect(self.on_connection_finished)
-            self.connection_worker.start()
+    def _spawn_connect(self, reconnect_addr: Optional[str]):
+        logger.info(
+            "Starting connection. Start fresh: %s, Reconnect addr: %s",
+            reconnect_addr is None,
+            reconnect_addr,
+        )
 
-        except Exception as e:
-            logger.error(f"Connection error: {e}")
-            QMessageBox.critical(self, "Connection Error", str(e))
-            self.reset_connection_ui()
+        self.connection_task = self.run_async(
+            self._connect_async("PRO_CONTROLLER", reconnect_addr)
+        )
+        self.connection_task.add_done_callback(self._on_connection_task_done)
 
     async def _connect_async(self, controller_type: str, reconnect_addr: Optional[str]):
+        from joycontrol.memory import FlashMemory
+        from joycontrol.protocol import controller_protocol_factory
+        from joycontrol.server import create_hid_server
+
         try:
             controller = Controller.from_arg(controller_type)
             spi_flash = FlashMemory()
@@ -1068,70 +1136,84 @@ class JoyControlGUI(QMainWindow):
                 interactive=False,
             )
 
+            self._itr_sock = getattr(self.transport, "_itr_sock", None)
+            self._peer_addr = None
+            if self._itr_sock is not None:
+                try:
+                    peer_info = self._itr_sock.getpeername()
+                    self._peer_addr = peer_info[0] if peer_info else None
+                except OSError as e:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Could not get peer address: %s", e)
+
+            self.watch_connection_lost(self.protocol)
             self.controller_state = self.protocol.get_controller_state()
 
             await self.controller_state.connect()
 
+            # the maps must exist before presses are accepted, which starts with
+            # connected below, not with the done callback that follows later
+            button_state = self.controller_state.button_state
+            self._press_fn = {
+                name: functools.partial(getattr(button_state, name), True)
+                for name in self._name_to_idx
+            }
+            self._release_fn = {
+                name: functools.partial(getattr(button_state, name), False)
+                for name in self._name_to_idx
+            }
+
             self.connected = True
 
         except Exception as e:
-            logger.error(f"Async connection error: {e}")
+            logger.error("Async connection error: %s", e)
             raise
 
+    def _on_connection_task_done(self, task: asyncio.Task):
+        if task.cancelled():
+            self.connection_task = None
+            return
+
+        error = task.exception()
+        if error is None:
+            self.on_connection_finished(True, "Success")
+        else:
+            self.on_connection_finished(False, str(error))
+
     def on_connection_finished(self, success: bool, message: str):
         try:
             if success:
                 self.status_label.setText("Connected")
-                self.status_label.setStyleSheet(
-                    f"color: {DarkTheme.BTN_ACTION}; font-weight: bold;"
-                )
+                self.status_label.setStyleSheet(_STATUS_QSS["connected"])
                 self.connect_btn.setText("Disconnect")
                 self.connect_btn.setEnabled(True)
 
-                addr = "Unknown"
-                try:
-                    if self.transport and hasattr(self.transport, "_itr_sock"):
-                        peer_info = self.transport._itr_sock.getpeername()
-                        addr = (
-                            peer_info[0]
-                            if peer_info
-                            else (self.reconnect_address or "Unknown")
-                        )
-                    else:
-                        addr = self.reconnect_address or "Unknown"
-                except Exception as e:
-                    logger.debug(f"Could not get peer address: {e}")
-                    addr = self.reconnect_address or "Unknown"
+                addr = self._peer_addr or self.reconnect_address or "Unknown"
 
                 if addr != "Unknown":
                     self._last_connected_address = addr
-                    logger.info(f"Stored address for auto-reconnect: {addr}")
+                    logger.info("Stored address for auto-reconnect: %s", addr)
 
                 self.connection_info.setText(f"Connected to: {addr}")
-                self.connection_info.setStyleSheet(
-                    f"color: {DarkTheme.BTN_ACTION}; font-size: 9pt;"
-                )
+                self.connection_info.setStyleSheet(_INFO_QSS["connected"])
 
-                self.connection_monitor_timer.start()
+                self.connection_heartbeat.start()
 
                 self.update_amiibo_button()
             else:
-                logger.error(f"Connection failed: {message}")
-                QMessageBox.critical(self, "Connection Failed", message)
+                logger.error("Connection failed: %s", message)
+                self.show_error("Connection Failed", message)
                 self.reset_connection_ui()
 
         finally:
-            self.connection_worker = None
+            self.connection_task = None
 
     def disconnect(self):
         try:
-            self.connection_monitor_timer.stop()
+            self.connection_heartbeat.stop()
 
-            if self.connection_worker and self.connection_worker.isRunning():
-                if self.connection_worker.future:
-                    self.connection_worker.future.cancel()
-                self.connection_worker.quit()
-                self.connection_worker.wait()
+            if self.connection_task and not self.connection_task.done():
+                self.connection_task.cancel()
 
             if self.transport:
                 self.run_async(self.transport.close())
@@ -1140,7 +1222,11 @@ class JoyControlGUI(QMainWindow):
             self.controller_state = None
             self.transport = None
             self.protocol = None
-            self.connection_worker = None
+            self._itr_sock = None
+            self._peer_addr = None
+            self._press_fn.clear()
+            self._release_fn.clear()
+            self.connection_task = None
 
             self.reconnect_address = None
             self.reconnect_entry.setText("")
@@ -1148,48 +1234,37 @@ class JoyControlGUI(QMainWindow):
 
             self.reset_connection_ui()
             self.status_label.setText("Disconnected")
-            self.status_label.setStyleSheet(
-                f"color: {DarkTheme.ERROR}; font-weight: bold;"
-            )
+            self.status_label.setStyleSheet(_STATUS_QSS["error"])
 
             self.connection_info.setText("Click Connect to choose your Nintendo Switch")
-            self.connection_info.setStyleSheet(
-                f"color: {DarkTheme.TEXT_SECONDARY}; font-size: 9pt;"
-            )
+            self.connection_info.setStyleSheet(_INFO_QSS["idle"])
 
         except Exception as e:
-            logger.error(f"Disconnect error: {e}")
+            logger.error("Disconnect error: %s", e)
 
     def reset_connection_ui(self):
         self.connect_btn.setText("Connect")
         self.connect_btn.setEnabled(True)
 
         self.connection_info.setText("Click Connect to choose your Nintendo Switch")
-        self.connection_info.setStyleSheet(
-            f"color: {DarkTheme.TEXT_SECONDARY}; font-size: 9pt;"
-        )
+        self.connection_info.setStyleSheet(_INFO_QSS["idle"])
 
-    def check_connection_status(self):
-        if not self.connected:
-            return
+    def watch_connection_lost(self, protocol):
+        protocol_connection_lost = protocol.connection_lost
 
-        try:
-            if self.protocol and self.protocol.transport is None:
-                logger.warning("Connection lost detected - protocol transport is None")
-                self.handle_connection_lost()
-                return
+        def connection_lost(exc: Optional[Exception] = None):
+            protocol_connection_lost(exc)
+            if self.connected and self.protocol is protocol:
+                logger.warning("Connection lost detected")
+                QTimer.singleShot(0, self.handle_connection_lost)
 
-            if self.transport and (
-                self.transport.is_closing() or not hasattr(self.transport, "_itr_sock")
-            ):
-                logger.warning(
-                    "Connection lost detected - transport is closing or invalid"
-                )
-                self.handle_connection_lost()
-                return
+        protocol.connection_lost = connection_lost
 
-        except Exception as e:
-            logger.error(f"Error checking connection status: {e}")
+    def check_connection_status(self):
+        if self.connected and (
+            self.protocol is None or self.protocol.transport is None
+        ):
+            logger.warning("Connection lost detected by heartbeat")
             self.handle_connection_lost()
 
     def handle_connection_lost(self):
@@ -1198,34 +1273,48 @@ class JoyControlGUI(QMainWindow):
 
         logger.info("Handling unexpected connection loss")
 
+        self.connection_heartbeat.stop()
         self.connected = False
         self.controller_state = None
         self.transport = None
         self.protocol = None
-
-        self.connection_monitor_timer.stop()
+        self._itr_sock = None
+        self._peer_addr = None
+        self._press_fn.clear()
+        self._release_fn.clear()
 
         self.reconnect_address = None
         self.reconnect_entry.setText("")
         logger.info(
-            f"Connection lost. Preserved last address: {getattr(self, '_last_connected_address', 'None')} for auto-reconnect"
+            "Connection lost. Preserved last address: %s for auto-reconnect",
+            self._last_connected_address or "None",
         )
 
         self.reset_connection_ui()
         self.status_label.setText("Connection Lost")
-        self.status_label.setStyleSheet(f"color: {DarkTheme.ERROR}; font-weight: bold;")
+        self.status_label.setStyleSheet(_STATUS_QSS["error"])
 
         self.connection_info.setText("Connection Lost - Click Connect to Reconnect")
-        self.connection_info.setStyleSheet(f"color: {DarkTheme.ERROR}; font-size: 9pt;")
+        self.connection_info.setStyleSheet(_INFO_QSS["error"])
 
         self.current_amiibo = None
         self.amiibo_status.setText("No amiibo loaded")
-        self.amiibo_status.setStyleSheet(f"color: {DarkTheme.TEXT_MUTED};")
+        self.amiibo_status.setStyleSheet(_AMIIBO_QSS["empty"])
         self.update_amiibo_button()
 
-        for button_name, button_widget in self.button_widgets.items():
-            button_widget.set_controller_pressed(False)
-            self.button_states[button_name] = False
+        self.setUpdatesEnabled(False)
+        try:
+            for button_widget in self._widgets:
+                button_widget.set_controller_pressed(False)
+        finally:
+            self.setUpdatesEnabled(True)
+        self._states[:] = bytes(len(self._states))
+
+        QTimer.singleShot(0, self._show_reconnect_prompt)
+
+    def _show_reconnect_prompt(self):
+        if self.connected:
+            return
 
         msg_box = QMessageBox(self)
         msg_box.setWindowTitle("Connection Lost")
@@ -1246,17 +1335,16 @@ class JoyControlGUI(QMainWindow):
     def auto_reconnect(self):
         try:
             logger.info(
-                f"Reconnect called. Last address: {getattr(self, '_last_connected_address', 'None')}"
+                "Reconnect called. Last address: %s",
+                self._last_connected_address or "None",
             )
             logger.info(
-                f"Current reconnect address: {getattr(self, 'reconnect_address', 'None')}"
+                "Current reconnect address: %s",
+                self.reconnect_address or "None",
             )
 
-            if (
-                hasattr(self, "_last_connected_address")
-                and self._last_connected_address
-            ):
-                logger.info(f"Reconnecting to {self._last_connected_address}")
+            if self._last_connected_address:
+                logger.info("Reconnecting to %s", self._last_connected_address)
                 self.reconnect_address = self._last_connected_address
                 self.reconnect_entry.setText(self._last_connected_address)
                 self.connect()
@@ -1265,46 +1353,84 @@ class JoyControlGUI(QMainWindow):
                 self.show_connection_dialog()
 
         except Exception as e:
-            logger.error(f"Error during auto-reconnect: {e}")
-            QMessageBox.critical(self, "Reconnect Failed", f"Failed to reconnect: {e}")
+            logger.error("Error during auto-reconnect: %s", e)
+            self.show_error("Reconnect Failed", f"Failed to reconnect: {e}")
 
     def on_button_press(self, button_name: str):
         if not self.connected or not self.controller_state:
             return
 
-        try:
-            self.button_states[button_name] = True
+        i = self._name_to_idx[button_name]
+        if self._states[i]:
+            return
 
-            if button_name in self.button_widgets:
-                self.button_widgets[button_name].set_controller_pressed(True)
+        try:
+            self._states[i] = 1
+            self._widgets[i].set_controller_pressed(True)
 
-            self.run_async(button_press(self.controller_state, button_name))
+            self._pending_release.discard(button_name)
+            self._pending_press.add(button_name)
+            self.schedule_button_flush()
 
         except Exception as e:
-            logger.error(f"Error handling button press {button_name}: {e}")
+            logger.error("Error handling button press %s: %s", button_name, e)
 
     def on_button_release(self, button_name: str):
+        i = self._name_to_idx[button_name]
         if not self.connected or not self.controller_state:
-            if button_name in self.button_widgets:
-                self.button_widgets[button_name].set_controller_pressed(False)
+            self._widgets[i].set_controller_pressed(False)
             return
 
-        try:
-            self.button_states[button_name] = False
+        if not self._states[i]:
+            return
 
-            if button_name in self.button_widgets:
-                self.button_widgets[button_name].set_controller_pressed(False)
+        try:
+            self._states[i] = 0
+            self._widgets[i].set_controller_pressed(False)
 
-            self.run_async(button_release(self.controller_state, button_name))
+            self._pending_release.add(button_name)
+            self.schedule_button_flush()
 
         except Exception as e:
-            logger.error(f"Error handling button release {button_name}: {e}")
+            logger.error("Error handling button release %s: %s", button_name, e)
+
+    def schedule_button_flush(self):
+        if self._button_pump is None or self._button_pump.done():
+            self._button_pump = self.run_async(self._pump_buttons())
+
+    async def _pump_buttons(self):
+        """
+        Sends pending button changes until none are left. Changes arriving while a
+        report is in flight are merged into the next one, and each report is sent
+        before the next set of changes is applied.
+        """
+        while self._pending_press or self._pending_release:
+            pressed, released = self._pending_press, self._pending_release
+            self._pending_press, self._pending_release = set(), set()
+
+            controller_state = self.controller_state
+            if not self.connected or not controller_state:
+                return
+
+            try:
+                for button_name in pressed:
+                    self._press_fn[button_name]()
+
+                # a press and release of the same button in one batch needs two reports
+                if pressed & released:
+                    await controller_state.send()
+
+                for button_name in released:
+                    self._release_fn[button_name]()
+
+                await controller_state.send()
+
+            except Exception as e:
+                logger.error("Error sending buttons: %s", e)
 
     def toggle_amiibo(self):
         if not self.connected or not self.controller_state:
-            QMessageBox.warning(
-                self, "Warning", "Please connect to a Nintendo Switch first!"
-            )
+            self.show_warning("Warning", "Please connect to a Nintendo Switch first!")
             return
 
         if self.current_amiibo:
@@ -1313,54 +1439,56 @@ class JoyControlGUI(QMainWindow):
                 self.current_amiibo = None
 
                 self.amiibo_status.setText("No amiibo loaded")
-                self.amiibo_status.setStyleSheet(f"color: {DarkTheme.TEXT_MUTED};")
+                self.amiibo_status.setStyleSheet(_AMIIBO_QSS["empty"])
                 self.update_amiibo_button()
 
             except Exception as e:
-                logger.error(f"Error ejecting amiibo: {e}")
-                QMessageBox.critical(self, "Error", f"Failed to eject amiibo: {e}")
+                logger.error("Error ejecting amiibo: %s", e)
+                self.show_error("Error", f"Failed to eject amiibo: {e}")
         else:
             file_path, _ = QFileDialog.getOpenFileName(
                 self, "Select Amiibo Dump", "", "Amiibo dumps (*.bin);;All files (*.*)"
             )
 
             if file_path:
-                try:
-                    nfc_tag = NFCTag.load_amiibo(file_path)
-                    self.controller_state.set_nfc(nfc_tag)
-                    self.current_amiibo = Path(file_path).name
+                # the dump is parsed off the GUI thread; the result is applied from
+                # a done callback so no modal box is opened while a task is executing
+                load = asyncio.get_event_loop().run_in_executor(
+                    None, _read_amiibo, file_path
+                )
+                load.add_done_callback(
+                    functools.partial(self._on_amiibo_loaded, file_path)
+                )
 
-                    self.amiibo_status.setText(f"{self.current_amiibo}")
-                    self.amiibo_status.setStyleSheet(
-                        f"color: {DarkTheme.BTN_ACTION}; font-weight: bold; font-size: 9pt;"
-                    )
-                    self.update_amiibo_button()
+    def _on_amiibo_loaded(self, file_path: str, load: asyncio.Future):
+        if load.cancelled() or not self.connected or not self.controller_state:
+            return
 
-                except Exception as e:
-                    logger.error(f"Error loading amiibo: {e}")
-                    QMessageBox.critical(self, "Error", f"Failed to load amiibo: {e}")
+        try:
+            nfc_tag = load.result()
+            self.controller_state.set_nfc(nfc_tag)
+            self.current_amiibo = os.path.basename(file_path)
+
+            self.amiibo_status.setText(f"{self.current_amiibo}")
+            self.amiibo_status.setStyleSheet(_AMIIBO_QSS["loaded"])
+            self.update_amiibo_button()
+
+        except Exception as e:
+            logger.error("Error loading amiibo: %s", e)
+            self.show_error("Error", f"Failed to load amiibo: {e}")
 
     def closeEvent(self, event):
         try:
-            self.connection_monitor_timer.stop()
+            self.connection_heartbeat.stop()
 
-            if self.connection_worker and self.connection_worker.isRunning():
-                if self.connection_worker.future:
-                    self.connection_worker.future.cancel()
-                self.connection_worker.quit()
-                self.connection_worker.wait()
+            if self.connection_task and not self.connection_task.done():
+                self.connection_task.cancel()
 
             if self.connected:
                 self.disconnect()
 
-            if self.async_loop:
-                self.async_loop.call_soon_threadsafe(self.async_loop.stop)
-
-            if self.async_thread and self.async_thread.is_alive():
-                self.async_thread.join(timeout=2.0)
-
         except Exception as e:
-            logger.error(f"Error during cleanup: {e}")
+            logger.error("Error during cleanup: %s", e)
 
         event.accept()
 
@@ -1377,9 +1505,6 @@ def main():
 
     log.configure(console_level=logging.WARNING)
 
-    if hasattr(Qt, "AA_ShareOpenGLContexts"):
-        QApplication.setAttribute(Qt.AA_ShareOpenGLContexts, True)
-
     app = QApplication(sys.argv)
     app.setApplicationName("joycontrol-gui")
     app.setApplicationVersion("1.0.0")
@@ -1390,14 +1515,21 @@ def main():
     font.setPointSize(max(8, font.pointSize()))
     app.setFont(font)
 
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+
     try:
         window = JoyControlGUI()
         window.show()
-        return app.exec()
+        # Ctrl+C closes the window so closeEvent can tear the connection down
+        loop.add_signal_handler(signal.SIGINT, window.close)
+        with loop:
+            loop.run_forever()
+        return 0
 
     except Exception as e:
         print(f"Failed to start application: {e}")
-        logger.error(f"Application startup error: {e}")
+        logger.error("Application startup error: %s", e)
         return 1
 
 